@@ -2,6 +2,7 @@ import numpy as np
 import scipy as sp
 import time
 import os
+from scipy.linalg.blas import daxpy
 from qss import proximal
 from qss import matrix
 from qss import util
@@ -81,10 +82,11 @@ def update_rho(
 
         local_new_rho_cand = min(max(local_new_rho_cand, RHO_MIN), RHO_MAX)
 
-        if local_new_rho_cand / rho_controller.rho_by_block[i] > 5:
+        rho_ratio = local_new_rho_cand / rho_controller.rho_by_block[i]
+        if rho_ratio > 5:
             # local_new_rho_cand = rho_controller.rho_by_block[i] * 5
             refactor = True
-        elif rho_controller.rho_by_block[i] / local_new_rho_cand > 5:
+        elif rho_ratio < 0.2:
             # local_new_rho_cand = rho_controller.rho_by_block[i] / 5
             refactor = True
         else:
@@ -149,11 +151,17 @@ def admm(
     eps_rel = options["eps_rel"]
     verbose = options["verbose"]
     max_iter = options["max_iter"]
+    debug = options["debug"]
+
+    # rho only changes in update_rho, so the expanded vectors are cached and
+    # refreshed there rather than rebuilt every iteration
+    rho_vec = rho_controller.get_rho_vec()
+    prox_rho_vec = rho_vec / obj_scale
 
     # ADMM iterates
     zk = x
     uk = (
-        y / rho_controller.get_rho_vec()
+        y / rho_vec
     )  # TODO: do smth with equil_scaling/obj_scale here?
     # TODO: initialize uk = -q / rho?
     xk1 = np.zeros(dim)
@@ -161,13 +169,28 @@ def admm(
     uk1 = np.zeros(dim)
     nuk1 = np.zeros(constr_dim)
 
+    # Right-hand side of the x-update, filled in place every iteration. The
+    # constraint part is constant, so it is written only once.
+    rhs = np.empty(dim + constr_dim)
+    rhs[dim:] = b
+    rhs_x = rhs[:dim]
+
+    # Over-relaxed iterate, shared by the z- and u-updates
+    relaxed = np.empty(dim)
+
+    # Loop-invariant norms used by the stopping criterion. They must be taken
+    # at the same order as the criterion itself.
+    stop_crit_ord = np.inf
+    q_norm = np.linalg.norm(q, ord=stop_crit_ord)
+    b_norm = np.linalg.norm(b, ord=stop_crit_ord)
+
     iter_num = 0
     refactorization_count = 0
     total_refactorization_time = 0
     finished = False
 
     while not finished:
-        if options["debug"] and (iter_num <= 5 or iter_num % 10 == 0):
+        if debug and (iter_num <= 5 or iter_num % 10 == 0):
             folder_loc = 'debug/'
             if not os.path.exists(folder_loc):
                 os.makedirs(folder_loc)
@@ -176,36 +199,32 @@ def admm(
             np.savetxt(folder_loc + fn_x, xk1)
             np.savetxt(folder_loc + fn_z, zk)
         iter_num += 1
-        rho_vec = rho_controller.get_rho_vec()
         if schedule_alpha and max_iter < np.inf:
             alpha = alpha_init * (max_iter - iter_num + 1) / max_iter
         else:
             alpha = alpha_init
 
         # Update x
+        np.subtract(zk, uk, out=rhs_x)
+        rhs_x *= rho_vec
+        rhs_x -= q
         if has_constr:
-            kkt_solve = kkt_system.solve(np.concatenate([-q + rho_vec * (zk - uk), b]))
+            kkt_solve = kkt_system.solve(rhs)
             xk1 = kkt_solve[:dim]
             nuk1 = kkt_solve[dim:]
         else:
-            xk1 = kkt_system.solve(-q + rho_vec * (zk - uk))
+            xk1 = kkt_system.solve(rhs_x)
 
-        # Update z
-        zk1 = g.prox(
-            rho_vec / obj_scale,
-            equil_scaling,
-            alpha * xk1 + (1 - alpha) * zk + uk,
-        )
+        # relaxed = alpha * xk1 + (1 - alpha) * zk + uk, built in place
+        np.multiply(zk, 1 - alpha, out=relaxed)
+        relaxed += uk
+        daxpy(xk1, relaxed, a=alpha)
 
-        # Update u
-        uk1 = uk + alpha * xk1 + (1 - alpha) * zk - zk1
+        # Update z
+        zk1 = g.prox(prox_rho_vec, equil_scaling, relaxed)
 
-        # Calculate residuals and objective
-        # r_prim = np.linalg.norm(xk1 - zk1, ord=2)
-        # r_dual = np.linalg.norm(rho_vec * (zk - zk1), ord=2)
-        r_prim = np.linalg.norm(A @ zk1 - b, ord=np.inf)
-        r_dual = np.linalg.norm(P @ zk1 + q + A.T @ nuk1 + rho_vec * uk1, ord=np.inf)
-        obj_val = util.evaluate_objective(P, q, r, g, zk1, obj_scale, equil_scaling)
+        # Update u. uk is not needed past this point, so its buffer is reused.
+        uk1 = np.subtract(relaxed, zk1, out=uk)
 
         # Check if we should stop
         if iter_num == max_iter or (
@@ -224,6 +243,9 @@ def admm(
                 q,
                 A,
                 b,
+                ord=stop_crit_ord,
+                q_norm=q_norm,
+                b_norm=b_norm,
             )
         ):
             finished = True
@@ -232,6 +254,17 @@ def admm(
         if verbose and (
             finished or iter_num == 1 or iter_num == max_iter or iter_num % 25 == 0
         ):
+            # Residuals and objective are only needed for printing, so they
+            # are not computed on iterations that don't report status
+            # r_prim = np.linalg.norm(xk1 - zk1, ord=2)
+            # r_dual = np.linalg.norm(rho_vec * (zk - zk1), ord=2)
+            r_prim = np.linalg.norm(A @ zk1 - b, ord=np.inf)
+            r_dual = np.linalg.norm(
+                P @ zk1 + q + A.T @ nuk1 + rho_vec * uk1, ord=np.inf
+            )
+            obj_val = util.evaluate_objective(
+                P, q, r, g, zk1, obj_scale, equil_scaling
+            )
             util.print_status(
                 iter_num,
                 obj_val,
@@ -261,6 +294,8 @@ def admm(
                 A,
                 b,
             )
+            rho_vec = rho_controller.get_rho_vec()
+            prox_rho_vec = rho_vec / obj_scale
 
         xk = xk1
         zk = zk1
@@ -268,7 +303,7 @@ def admm(
 
     iterates = {}
     iterates["x"] = zk1
-    iterates["y"] = rho_controller.get_rho_vec() * uk1
+    iterates["y"] = rho_vec * uk1
     iterates["obj_val"] = util.evaluate_objective(
         P, q, r, g, zk1, obj_scale, equil_scaling
     )
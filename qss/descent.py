@@ -226,6 +226,10 @@ def proj_sd(
     )
     F = qdldl.Solver(new_kkt)
 
+    # Right-hand side of the projection solve. The constraint part is always
+    # zero, so only the first dim entries are overwritten each iteration.
+    proj_rhs = np.zeros(dim + len(b))
+
     while (not finished) and (iter_num < max_iter):
         iter_num += 1
 
@@ -235,7 +239,8 @@ def proj_sd(
             v_st_np, dF_v = l2_descent_dir(g, x, P, q, r, equil_scaling, obj_scale)
 
         # v_st = F.solve(np.concatenate([P @ v_st_np - q, np.zeros_like(b_constr)]))[:dim]
-        v_st = F.solve(np.concatenate([v_st_np, np.zeros_like(b)]))[:dim]
+        proj_rhs[:dim] = v_st_np
+        v_st = F.solve(proj_rhs)[:dim]
 
         if descent_method == "momentum":
             v_st = momentum * prev_step + v_st
@@ -3,9 +3,13 @@ import scipy as sp
 import qdldl
 from qss import linearoperator
 
+# Once this many consecutive KKT solves have needed no rounds of iterative
+# refinement, refinement is skipped until the next refactorization
+IR_SKIP_AFTER = 10
+
 
 class KKT:
-    def __init__(self, P, A, rho_controller):
+    def __init__(self, P, A, rho_controller, use_iter_refinement=False):
         self._dim = A.shape[1]
         self._constr_dim = A.shape[0]
         self._has_constr = A.nnz != 0
@@ -24,24 +28,49 @@ class KKT:
         else:
             self._raw_system = P + sp.sparse.diags(self._rho_vec)
 
+        # Store the system in canonical CSC form and record where the first
+        # dim diagonal entries live in its data array, so that rho updates
+        # can modify them in place without building new sparse matrices
+        self._raw_system = sp.sparse.csc_matrix(self._raw_system)
+        self._raw_system.sum_duplicates()
+        cols = np.repeat(
+            np.arange(self._raw_system.shape[1]), np.diff(self._raw_system.indptr)
+        )
+        self._rho_diag_indices = np.flatnonzero(
+            (self._raw_system.indices == cols) & (cols < self._dim)
+        )
+
         self._fac_system = qdldl.Solver(self._raw_system)
 
+        # Iterative refinement only matters when the constraint block is
+        # regularized. Refinement is done against the unregularized system.
+        self._reg = reg
+        self._use_iter_refinement = use_iter_refinement and self._has_constr
+        self._unreg_system = sp.sparse.linalg.LinearOperator(
+            self._raw_system.shape, matvec=self._unreg_matvec
+        )
+        self._ir_streak = 0
+
+    def _unreg_matvec(self, v):
+        res = self._raw_system @ v
+        res[self._dim :] -= self._reg * v[self._dim :]
+        return res
+
     def solve(self, rhs):
-        return self._fac_system.solve(rhs)
+        if not self._use_iter_refinement or self._ir_streak >= IR_SKIP_AFTER:
+            return self._fac_system.solve(rhs)
 
-    def update_rho(self, new_rho_vec):
-        if self._has_constr:
-            I0_matrix = sp.sparse.block_diag(
-                [
-                    sp.sparse.diags(new_rho_vec - self._rho_vec, format="csc"),
-                    sp.sparse.csc_matrix((self._constr_dim, self._constr_dim)),
-                ]
-            )
+        sol, num_rounds = ir_solve(self._unreg_system, self._fac_system, rhs)
+        if num_rounds == 0:
+            self._ir_streak += 1
         else:
-            I0_matrix = sp.sparse.diags(new_rho_vec - self._rho_vec, format="csc")
+            self._ir_streak = 0
+        return sol
 
-        self._raw_system += I0_matrix
+    def update_rho(self, new_rho_vec):
+        self._raw_system.data[self._rho_diag_indices] += new_rho_vec - self._rho_vec
         self._fac_system.update(self._raw_system)
+        self._ir_streak = 0
 
         self._rho_vec = np.copy(new_rho_vec)
 
@@ -101,15 +130,17 @@ def build_kkt(reg, rho, P, A, dim, constr_dim, **kwargs):
     )
 
 
-def ir_solve(A, Atilde, b):
-    tol = 1e-7
+def ir_solve(A, Atilde, b, tol=1e-7, max_iter=10):
+    # Returns the refined solution and the number of refinement rounds taken.
+    # The residual is computed once per round and compared against a
+    # tolerance relative to b, so well-conditioned systems exit right after
+    # the first solve.
+    tol *= max(1, np.linalg.norm(b, ord=np.inf))
     lk = Atilde.solve(b)
+    rk = b - A @ lk
     k = 0
-    while np.linalg.norm(A @ lk - b, ord=np.inf) > tol:
-        lk = lk + Atilde.solve(b - A @ lk)
+    while k < max_iter and np.linalg.norm(rk, ord=np.inf) > tol:
+        lk += Atilde.solve(rk)
+        rk = b - A @ lk
         k += 1
-    """
-    if k != 0:
-        print("Did", k, "rounds of iterative refinement")
-    """
-    return lk
+    return lk, k
@@ -20,6 +20,14 @@ G_FUNC_NAMES = {
 }
 
 
+def _soft_threshold(v, t):
+    # sign(v) * max(|v| - t, 0), computed in place on a single output buffer
+    output = np.abs(v, out=np.empty(np.shape(v)))
+    output -= t
+    np.maximum(output, 0, out=output)
+    return np.copysign(output, v, out=output)
+
+
 class G(ABC):
     def __init__(self, weight, scale, shift):
         self._weight = weight
@@ -42,13 +50,20 @@ class G(ABC):
     def evaluate(self, v):
         return self._weight * self.evaluate_raw(self._scale * v - self._shift)
 
-    def prox(self, rho, equil_scaling, v):
+    def evaluate_sum(self, v):
+        return np.sum(self.evaluate(v))
+
+    def prox(self, rho, equil_scaling, v, out=None):
         new_scale = equil_scaling * self._scale
         new_rho = rho / (self._weight * new_scale**2)
 
-        return (
-            self.prox_raw(new_rho, new_scale * v - self._shift) + self._shift
-        ) / new_scale
+        # Work in place on a single scratch array rather than allocating a
+        # new temporary for every arithmetic step
+        scaled_v = np.multiply(new_scale, v, dtype=float)
+        scaled_v -= self._shift
+        res = np.asarray(self.prox_raw(new_rho, scaled_v), dtype=float)
+        res += self._shift
+        return np.divide(res, new_scale, out=out)
 
     def subdiff(self, equil_scaling, obj_scale, v):
         g_ls, g_rs = self.subdiff_raw(self._scale * equil_scaling * v - self._shift)
@@ -58,6 +73,19 @@ class G(ABC):
         return g_ls, g_rs
 
 
+class Indicator(G):
+    # Indicators only take the values 0 and inf, so with a scalar weight their
+    # sum is a single reduction over v rather than an elementwise array
+    @abstractmethod
+    def evaluate_raw_sum(self, v):
+        pass
+
+    def evaluate_sum(self, v):
+        if np.ndim(self._weight) != 0:
+            return super().evaluate_sum(v)
+        return self._weight * self.evaluate_raw_sum(self._scale * v - self._shift)
+
+
 class Zero(G):
     def __init__(self, weight, scale, shift):
         super().__init__(weight, scale, shift)
@@ -83,26 +111,21 @@ class Abs(G):
         return np.abs(v)
 
     def prox_raw(self, rho, v):
-        return np.maximum(v - 1 / rho, 0) - np.maximum(-v - 1 / rho, 0)
+        return _soft_threshold(v, 1 / rho)
 
     def subdiff_raw(self, v):
         v = np.asarray(v)
-        ls = np.zeros(v.shape)
-        rs = np.zeros(v.shape)
-
-        ls[v < 0] = -1
-        rs[v < 0] = -1
-
-        ls[v > 0] = 1
-        rs[v > 0] = 1
+        ls = np.sign(v, out=np.empty(v.shape))
+        rs = np.copy(ls)
 
-        ls[np.isclose(v, 0)] = -1
-        rs[np.isclose(v, 0)] = 1
+        near_zero = np.isclose(v, 0)
+        ls[near_zero] = -1
+        rs[near_zero] = 1
 
         return ls, rs
 
 
-class IsPos(G):
+class IsPos(Indicator):
     def __init__(self, weight, scale, shift):
         super().__init__(weight, scale, shift)
         self._is_convex = True
@@ -111,25 +134,29 @@ class IsPos(G):
         v = np.asarray(v)
         return np.where(v >= 0, 0, np.inf)
 
+    def evaluate_raw_sum(self, v):
+        return 0 if np.size(v) == 0 or np.min(v) >= 0 else np.inf
+
     def prox_raw(self, rho, v):
-        v = np.asarray(v)
-        return np.where(v < 0, 0, v)
+        return np.maximum(v, 0)
 
     def subdiff_raw(self, v):
         v = np.asarray(v)
         ls = np.zeros(v.shape)
         rs = np.zeros(v.shape)
 
-        ls[v < 0] = np.nan
-        rs[v < 0] = np.nan
+        neg = v < 0
+        ls[neg] = np.nan
+        rs[neg] = np.nan
 
-        ls[v == 0] = -np.inf
-        rs[v == 0] = 0
+        zero = v == 0
+        ls[zero] = -np.inf
+        rs[zero] = 0
 
         return ls, rs
 
 
-class IsNeg(G):
+class IsNeg(Indicator):
     def __init__(self, weight, scale, shift):
         super().__init__(weight, scale, shift)
         self._is_convex = True
@@ -138,25 +165,29 @@ class IsNeg(G):
         v = np.asarray(v)
         return np.where(v <= 0, 0, np.inf)
 
+    def evaluate_raw_sum(self, v):
+        return 0 if np.size(v) == 0 or np.max(v) <= 0 else np.inf
+
     def prox_raw(self, rho, v):
-        v = np.asarray(v)
-        return np.where(v > 0, 0, v)
+        return np.minimum(v, 0)
 
     def subdiff_raw(self, v):
         v = np.asarray(v)
         ls = np.zeros(v.shape)
         rs = np.zeros(v.shape)
 
-        ls[v > 0] = np.nan
-        rs[v > 0] = np.nan
+        pos = v > 0
+        ls[pos] = np.nan
+        rs[pos] = np.nan
 
-        ls[v == 0] = 0
-        rs[v == 0] = np.inf
+        zero = v == 0
+        ls[zero] = 0
+        rs[zero] = np.inf
 
         return ls, rs
 
 
-class IsBound(G):
+class IsBound(Indicator):
     def __init__(self, weight, scale, shift, lb, ub):
         super().__init__(weight, scale, shift)
         self._lb = lb
@@ -166,32 +197,39 @@ class IsBound(G):
     def evaluate_raw(self, v):
         return np.where((v >= self._lb) & (v <= self._ub), 0, np.inf)
 
+    def evaluate_raw_sum(self, v):
+        if np.size(v) == 0 or (np.min(v) >= self._lb and np.max(v) <= self._ub):
+            return 0
+        return np.inf
+
     def prox_raw(self, rho, v):
-        output = np.where(v >= self._ub, self._ub, v)
-        output = np.where(output <= self._lb, self._lb, output)
-        return output
+        return np.clip(v, self._lb, self._ub)
 
     def subdiff_raw(self, v):
         v = np.asarray(v)
         ls = np.zeros(v.shape)
         rs = np.zeros(v.shape)
 
-        ls[v > self._ub] = np.nan
-        rs[v > self._ub] = np.nan
+        above = v > self._ub
+        ls[above] = np.nan
+        rs[above] = np.nan
 
-        ls[v == self._ub] = 0
-        rs[v == self._ub] = np.inf
+        at_ub = v == self._ub
+        ls[at_ub] = 0
+        rs[at_ub] = np.inf
 
-        ls[v < self._lb] = np.nan
-        rs[v < self._lb] = np.nan
+        below = v < self._lb
+        ls[below] = np.nan
+        rs[below] = np.nan
 
-        ls[v == self._lb] = -np.inf
-        rs[v == self._lb] = 0
+        at_lb = v == self._lb
+        ls[at_lb] = -np.inf
+        rs[at_lb] = 0
 
         return ls, rs
 
 
-class IsZero(G):
+class IsZero(Indicator):
     def __init__(self, weight, scale, shift):
         super().__init__(weight, scale, shift)
         self._is_convex = True
@@ -199,6 +237,9 @@ class IsZero(G):
     def evaluate_raw(self, v):
         return np.where(v == 0, 0, np.inf)
 
+    def evaluate_raw_sum(self, v):
+        return np.inf if np.any(v) else 0
+
     def prox_raw(self, rho, v):
         return np.zeros(np.asarray(v).shape)
 
@@ -207,8 +248,9 @@ class IsZero(G):
         ls = np.nan * np.ones(v.shape)
         rs = np.nan * np.ones(v.shape)
 
-        ls[v == 0] = -np.inf
-        rs[v == 0] = np.inf
+        zero = v == 0
+        ls[zero] = -np.inf
+        rs[zero] = np.inf
 
         return ls, rs
 
@@ -231,12 +273,14 @@ class Pos(G):
         ls = np.zeros(v.shape)
         rs = np.zeros(v.shape)
 
-        ls[v > 0] = 1
-        rs[v > 0] = 1
+        pos = v > 0
+        ls[pos] = 1
+        rs[pos] = 1
 
         # TODO: change this to is_close?
-        ls[v == 0] = 0
-        rs[v == 0] = 1
+        zero = v == 0
+        ls[zero] = 0
+        rs[zero] = 1
 
         return ls, rs
 
@@ -257,12 +301,14 @@ class Neg(G):
         ls = np.zeros(v.shape)
         rs = np.zeros(v.shape)
 
-        ls[v < 0] = -1
-        rs[v < 0] = -1
+        neg = v < 0
+        ls[neg] = -1
+        rs[neg] = -1
 
         # TODO: change this to is_close?
-        ls[v == 0] = -1
-        rs[v == 0] = 0
+        zero = v == 0
+        ls[zero] = -1
+        rs[zero] = 0
 
         return ls, rs
 
@@ -285,8 +331,9 @@ class Card(G):
         ls = np.nan * np.ones(v.shape)
         rs = np.nan * np.ones(v.shape)
 
-        ls[v == 0] = 0
-        rs[v == 0] = 0
+        zero = v == 0
+        ls[zero] = 0
+        rs[zero] = 0
 
         return ls, rs
 
@@ -324,24 +371,25 @@ class Quantile(G):
 
     def prox_raw(self, rho, v):
         v_mod = np.asarray(v) + 1 / rho * (0.5 - self._tau)
-        return np.where(
-            np.abs(v_mod) <= 1 / (2 * rho), 0, v_mod - np.sign(v_mod) * 1 / (2 * rho)
-        )
+        return _soft_threshold(v_mod, 1 / (2 * rho))
 
     def subdiff_raw(self, v):
         v = np.asarray(v)
         ls = np.zeros(v.shape)
         rs = np.zeros(v.shape)
 
-        ls[v > 0] = self._tau
-        rs[v > 0] = self._tau
+        pos = v > 0
+        ls[pos] = self._tau
+        rs[pos] = self._tau
 
-        ls[v < 0] = self._tau - 1
-        rs[v < 0] = self._tau - 1
+        neg = v < 0
+        ls[neg] = self._tau - 1
+        rs[neg] = self._tau - 1
 
         # TODO: change to is_close?
-        ls[v == 0] = self._tau - 1
-        rs[v == 0] = self._tau
+        zero = v == 0
+        ls[zero] = self._tau - 1
+        rs[zero] = self._tau
 
         return ls, rs
 
@@ -372,14 +420,17 @@ class Huber(G):
 
         abs_v = np.abs(v)
 
-        ls[abs_v <= self._M] = 2 * v[abs_v <= self._M]
-        rs[abs_v <= self._M] = 2 * v[abs_v <= self._M]
+        inner = abs_v <= self._M
+        ls[inner] = 2 * v[inner]
+        rs[inner] = 2 * v[inner]
 
-        ls[v > self._M] = 2 * self._M
-        rs[v > self._M] = 2 * self._M
+        above = v > self._M
+        ls[above] = 2 * self._M
+        rs[above] = 2 * self._M
 
-        ls[v < self._M] = -2 * self._M
-        rs[v < self._M] = -2 * self._M
+        below = v < self._M
+        ls[below] = -2 * self._M
+        rs[below] = -2 * self._M
 
         return ls, rs
 
@@ -475,9 +526,20 @@ class IsBool(G):
         return ls, rs
 
 
+# Elementwise g's with no parameters beyond weight, scale, and shift. Blocks of
+# the same type can be stacked and handled with a single prox call.
+BATCHABLE_G_TYPES = (Abs, IsPos, IsNeg, IsZero, Pos, Neg, Card, IsInt)
+
+# Runs of at least this many entries get their own prox call, since gathering
+# stops paying off at about 1-4k entries per block
+PROX_BATCH_MAX_RUN_SIZE = 1024
+
+
 class GCollection:
     def __init__(self, g_list, dim, relax=False):
-        self._g_list = []
+        # (start_index, end_index, func) tuples, unpacked once here so the
+        # per-iteration loops below avoid repeated dict lookups
+        self._g_compiled = []
         self._is_convex = True
         self._all_zeros = True
         self._full_g = False
@@ -577,7 +639,7 @@ class GCollection:
 
             if not func._is_convex:
                 self._is_convex = False
-            self._g_list.append({"range": range, "func": func})
+            self._g_compiled.append((range[0], range[1], func))
 
             if name != "zero":
                 self._all_zeros = False
@@ -589,27 +651,87 @@ class GCollection:
             self._full_g = True
             self.bool_ranges = self.bool_ranges[:-1]
 
+        # Resolve each group's prox method and index kind once, so the loop in
+        # prox does no per-call type checks or attribute lookups
+        self._prox_dispatch = [
+            (index, func.prox, isinstance(index, slice))
+            for index, func in self._build_prox_groups()
+        ]
+
+    def _build_prox_groups(self):
+        # Returns a list of (index, func) pairs, where index is a slice or an
+        # index array into the full variable. Batchable blocks of the same type
+        # that directly follow each other are merged into runs handled through
+        # a slice. Small runs of the same type are gathered into one call with
+        # an index array; large runs keep their own slice, since gathering
+        # them costs more than the call it saves. Merged funcs carry
+        # per-element weight, scale, and shift arrays. Zero blocks are left
+        # out, since their prox is the identity.
+        prox_groups = []
+        batches = {}
+
+        for start_index, end_index, func in self._g_compiled:
+            if type(func) is Zero or start_index == end_index:
+                continue
+            if type(func) in BATCHABLE_G_TYPES:
+                batches.setdefault(type(func), []).append(
+                    (start_index, end_index, func)
+                )
+            else:
+                prox_groups.append((slice(start_index, end_index), func))
+
+        for g_type, blocks in batches.items():
+            runs = []
+            for block in sorted(blocks, key=lambda block: block[0]):
+                if runs and runs[-1][-1][1] == block[0]:
+                    runs[-1].append(block)
+                else:
+                    runs.append([block])
+
+            small_blocks = []
+            for run in runs:
+                if run[-1][1] - run[0][0] >= PROX_BATCH_MAX_RUN_SIZE:
+                    prox_groups.append(self._merge_prox_blocks(g_type, run))
+                else:
+                    small_blocks.extend(run)
+            if small_blocks:
+                prox_groups.append(self._merge_prox_blocks(g_type, small_blocks))
+
+        return prox_groups
+
+    def _merge_prox_blocks(self, g_type, blocks):
+        # blocks must be sorted by start index
+        if len(blocks) == 1:
+            start_index, end_index, func = blocks[0]
+            return slice(start_index, end_index), func
+
+        index = np.concatenate([np.arange(s, e) for s, e, _ in blocks])
+        params = [
+            np.concatenate(
+                [np.broadcast_to(getattr(f, attr), e - s) for s, e, f in blocks]
+            )
+            for attr in ("_weight", "_scale", "_shift")
+        ]
+        if np.all(np.diff(index) == 1):
+            index = slice(int(index[0]), int(index[-1]) + 1)
+        return index, g_type(*params)
+
     def evaluate(self, v):
-        output = np.zeros(np.asarray(v).shape)
+        total = 0.0
 
-        for item in self._g_list:
-            start_index, end_index = item["range"]
-            func = item["func"]
-            output[start_index:end_index] = func.evaluate(v[start_index:end_index])
+        for start_index, end_index, func in self._g_compiled:
+            total += func.evaluate_sum(v[start_index:end_index])
 
-        return np.sum(output)
+        return total
 
     def prox(self, rho_vec, equil_scaling, v):
-        output = np.copy(v)
+        output = np.array(v, dtype=float)
 
-        for item in self._g_list:
-            start_index, end_index = item["range"]
-            func = item["func"]
-            output[start_index:end_index] = func.prox(
-                rho_vec[start_index:end_index],
-                equil_scaling[start_index:end_index],
-                v[start_index:end_index],
-            )
+        for index, prox, is_slice in self._prox_dispatch:
+            if is_slice:
+                prox(rho_vec[index], equil_scaling[index], v[index], out=output[index])
+            else:
+                output[index] = prox(rho_vec[index], equil_scaling[index], v[index])
 
         return output
 
@@ -618,9 +740,7 @@ class GCollection:
         ls = np.zeros(v.shape)
         rs = np.zeros(v.shape)
 
-        for item in self._g_list:
-            start_index, end_index = item["range"]
-            func = item["func"]
+        for start_index, end_index, func in self._g_compiled:
             g_ls, g_rs = func.subdiff(
                 equil_scaling[start_index:end_index],
                 obj_scale,
@@ -223,7 +223,10 @@ class QSS:
             )
         else:
             self._kkt_system = matrix.KKT(
-                self._data["P"], self._data["A"], self._rho_controller
+                self._data["P"],
+                self._data["A"],
+                self._rho_controller,
+                use_iter_refinement=self._options["use_iter_refinement"],
             )
         if self._options["verbose"]:
             print(
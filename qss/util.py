@@ -24,6 +24,8 @@ def evaluate_stop_crit(
         b,
         crit="orig",
         ord=np.inf,
+        q_norm=None,
+        b_norm=None,
 ):
     if crit == "admm":
         r_prim = np.linalg.norm(xk1 - zk1, ord=ord)
@@ -32,16 +34,23 @@ def evaluate_stop_crit(
         edual = eps_rel * np.linalg.norm(rho_vec * uk1, ord=ord)
 
     elif crit == "orig":
+        # q and b are constant during a solve, so callers checking repeatedly
+        # can pass in their precomputed norms. These must be taken at the same
+        # ord as the criterion.
+        if q_norm is None:
+            q_norm = np.linalg.norm(q, ord=ord)
+        if b_norm is None:
+            b_norm = np.linalg.norm(b, ord=ord)
         Azk1 = A @ zk1
         Pzk1 = P @ zk1
         ATnuk1 = A.T @ nuk1
         rhouk1 = rho_vec * uk1
         r_prim = np.linalg.norm(Azk1 - b, ord=ord)
         r_dual = np.linalg.norm(Pzk1 + q + ATnuk1 + rhouk1, ord=ord)
-        epri = eps_rel * max(np.linalg.norm(Azk1, ord=ord), np.linalg.norm(b, ord=ord))
+        epri = eps_rel * max(np.linalg.norm(Azk1, ord=ord), b_norm)
         edual = eps_rel * max(
             np.linalg.norm(Pzk1, ord=ord),
-            np.linalg.norm(q, ord=ord),
+            q_norm,
             np.linalg.norm(ATnuk1, ord=ord),
             np.linalg.norm(rhouk1, ord=ord),
         )
@@ -105,7 +114,7 @@ class RhoController:
     def __init__(self, g, rho_init):
         # The last element of rho_by_block corresponds to zeros entries.
         # TODO: the below assumes that there are no "zero" g's.
-        self.rho_by_block = rho_init * np.ones(len(g._g_list) + 1)
+        self.rho_by_block = rho_init * np.ones(len(g._g_compiled) + 1)
         # self.rho_by_block[0] = 1e10
         # self.rho_by_block[1] = 1e-10
         # self.rho_by_block = np.ones(len(g._g_list) + 1)
@@ -121,8 +130,7 @@ class RhoController:
     def get_rho_vec(self):
         rho_vec = self.rho_by_block[-1] * np.ones(self._g.dim)
 
-        for index, g in enumerate(self._g._g_list):
-            start_index, end_index = g["range"]
+        for index, (start_index, end_index, _) in enumerate(self._g._g_compiled):
             rho_vec[start_index:end_index] = self.rho_by_block[index]
 
         return rho_vec
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+import scipy as sp
+import qdldl
+from qss import matrix
+from qss import proximal
+from qss import util
+
+
+def random_kkt(use_iter_refinement=True, has_constr=True):
+    np.random.seed(1234)
+    dim = 20
+    constr_dim = 5 if has_constr else 0
+    P = sp.sparse.random(dim, dim, density=0.2, format="csc")
+    P = P @ P.T
+    A = sp.sparse.random(constr_dim, dim, density=0.5, format="csc")
+    g = proximal.GCollection([{"g": "abs", "range": (0, 10)}], dim)
+    rho_controller = util.RhoController(g, 0.1)
+    kkt = matrix.KKT(P, A, rho_controller, use_iter_refinement=use_iter_refinement)
+    return kkt, rho_controller, P, A, dim, constr_dim
+
+
+class TestIRSolve:
+    def test_refinement_runs(self):
+        np.random.seed(1234)
+        n = 30
+        M = sp.sparse.random(n, n, density=0.2, format="csc")
+        A = (M + M.T + 5 * sp.sparse.eye(n)).tocsc()
+        # Factor a perturbed matrix so the first solve is inexact
+        Atilde = qdldl.Solver((A + 1e-2 * sp.sparse.eye(n)).tocsc())
+        b = np.random.randn(n)
+
+        tol = 1e-10
+        x, k = matrix.ir_solve(A, Atilde, b, tol=tol)
+
+        assert k > 0
+        residual = np.linalg.norm(A @ x - b, ord=np.inf)
+        assert residual <= tol * max(1, np.linalg.norm(b, ord=np.inf))
+
+    def test_max_iter(self):
+        np.random.seed(1234)
+        n = 10
+        A = sp.sparse.eye(n, format="csc")
+        Atilde = qdldl.Solver(2 * sp.sparse.eye(n, format="csc"))
+        b = np.random.randn(n)
+
+        x, k = matrix.ir_solve(A, Atilde, b, tol=1e-30, max_iter=3)
+
+        assert k == 3
+
+
+class TestKKT:
+    def test_unreg_matvec(self):
+        kkt, rho_controller, P, A, dim, constr_dim = random_kkt()
+        unreg = matrix.build_kkt(0, 0.1, P, A, dim, constr_dim)
+        v = np.random.randn(dim + constr_dim)
+
+        # Tight tolerance, since the regularization is only 1e-7
+        assert np.allclose(kkt._unreg_matvec(v), unreg @ v, rtol=0, atol=1e-12)
+
+    def test_solve_refined(self):
+        kkt, rho_controller, P, A, dim, constr_dim = random_kkt()
+        unreg = matrix.build_kkt(0, 0.1, P, A, dim, constr_dim)
+        rhs = np.random.randn(dim + constr_dim)
+
+        x = kkt.solve(rhs)
+
+        residual = np.linalg.norm(unreg @ x - rhs, ord=np.inf)
+        assert residual <= 1e-7 * max(1, np.linalg.norm(rhs, ord=np.inf))
+
+    def test_update_rho_resets_ir_streak(self):
+        kkt, rho_controller, P, A, dim, constr_dim = random_kkt()
+        rhs = np.random.randn(dim + constr_dim)
+
+        # Once the streak reaches IR_SKIP_AFTER, solves bypass refinement
+        kkt._ir_streak = matrix.IR_SKIP_AFTER
+        kkt.solve(rhs)
+        assert kkt._ir_streak == matrix.IR_SKIP_AFTER
+
+        rho_controller.rho_by_block[:] = 1
+        kkt.update_rho(rho_controller.get_rho_vec())
+        assert kkt._ir_streak == 0
+
+    @pytest.mark.parametrize("has_constr", [True, False])
+    def test_update_rho_raw_system(self, has_constr):
+        kkt, rho_controller, P, A, dim, constr_dim = random_kkt(has_constr=has_constr)
+        new_rho_vec = np.random.uniform(0.5, 2, dim)
+
+        kkt.update_rho(new_rho_vec)
+
+        expected = P + sp.sparse.diags(new_rho_vec)
+        if has_constr:
+            expected = sp.sparse.vstack(
+                [
+                    sp.sparse.hstack([expected, A.T]),
+                    sp.sparse.hstack([A, kkt._reg * sp.sparse.eye(constr_dim)]),
+                ]
+            )
+        assert np.allclose(kkt._raw_system.toarray(), expected.toarray(), rtol=0)
@@ -234,3 +234,74 @@ class TestGCollection:
 
         assert self.gcoll3._is_convex is True
         assert self.gcoll3._all_zeros is True
+
+    def test_prox_batched(self):
+        big = proximal.PROX_BATCH_MAX_RUN_SIZE
+        dim = 17 + big
+        g = [
+            # Small abs blocks, gathered through an index array
+            {"g": "abs", "range": (0, 3), "args": {"weight": 2}},
+            {"g": "is_pos", "range": (3, 5)},
+            {"g": "abs", "range": (5, 8), "args": {"scale": 3, "shift": 1}},
+            {"g": "zero", "range": (8, 9)},
+            {"g": "huber", "range": (9, 12)},
+            # Adjacent pos blocks, merged into one batched slice
+            {"g": "pos", "range": (12, 14), "args": {"weight": 2}},
+            {"g": "pos", "range": (14, 17), "args": {"shift": -1}},
+            # Large abs block, kept as its own slice
+            {"g": "abs", "range": (17, dim), "args": {"weight": 0.5}},
+        ]
+        gcoll = proximal.GCollection(g, dim)
+        np.random.seed(1234)
+        v = np.random.randn(dim)
+        rho_vec = np.random.rand(dim) + 0.5
+        equil_scaling = np.random.rand(dim) + 0.5
+
+        index_by_type = {}
+        for index, prox, _ in gcoll._prox_dispatch:
+            index_by_type.setdefault(type(prox.__self__), []).append(index)
+        large_abs_index, small_abs_index = index_by_type[proximal.Abs]
+        assert large_abs_index == slice(17, dim)
+        assert np.array_equal(small_abs_index, [0, 1, 2, 5, 6, 7])
+        assert index_by_type[proximal.Pos] == [slice(12, 17)]
+
+        expected = np.copy(v)
+        for start_index, end_index, func in gcoll._g_compiled:
+            expected[start_index:end_index] = func.prox(
+                rho_vec[start_index:end_index],
+                equil_scaling[start_index:end_index],
+                v[start_index:end_index],
+            )
+
+        assert np.allclose(gcoll.prox(rho_vec, equil_scaling, v), expected)
+
+    def test_evaluate_indicators(self):
+        g = [
+            {"g": "is_pos", "range": (0, 2)},
+            {"g": "is_neg", "range": (2, 4)},
+            {"g": "is_bound", "range": (4, 6), "args": {"lb": -1, "ub": 2}},
+            {"g": "is_zero", "range": (6, 8)},
+            {"g": "abs", "range": (8, 10), "args": {"weight": 3}},
+        ]
+        gcoll = proximal.GCollection(g, 10)
+
+        v = np.array([0, 1, -1, 0, -1, 2, 0, 0, -2, 1])
+        assert gcoll.evaluate(v) == 9
+
+        # One infeasible value per indicator entry
+        violations = [-1, -1, 1, 1, -2, 3, 1, -1]
+        for i, violation in enumerate(violations):
+            v_bad = np.copy(v)
+            v_bad[i] = violation
+            assert gcoll.evaluate(v_bad) == np.inf
+
+        # Array weights are applied elementwise before summing
+        g_array = [
+            {"g": "abs", "range": (0, 3), "args": {"weight": np.array([1.0, 2.0, 3.0])}},
+            {"g": "is_pos", "range": (3, 5), "args": {"weight": np.array([1.0, 2.0])}},
+        ]
+        gcoll_array = proximal.GCollection(g_array, 5)
+        res = gcoll_array.evaluate(np.array([1, 1, -1, 0, 2]))
+        assert np.ndim(res) == 0
+        assert res == 6
+        assert gcoll_array.evaluate(np.array([1, 1, -1, -1, 2])) == np.inf
@@ -221,7 +221,8 @@ def test_l1_trend_filtering(_verbose):
     assert prob.solve() == pytest.approx(qss_result, rel=1e-2)
 
 
-def test_lp(_verbose):
+@pytest.mark.parametrize("use_iter_refinement", [False, True])
+def test_lp(_verbose, use_iter_refinement):
     np.random.seed(1234)
     dim = 100
     constr_dim = 30
@@ -249,7 +250,9 @@ def test_lp(_verbose):
 
     # QSS
     solver = qss.QSS(data)
-    qss_result, x_qss = solver.solve(verbose=_verbose)
+    qss_result, x_qss = solver.solve(
+        verbose=_verbose, use_iter_refinement=use_iter_refinement
+    )
 
     assert prob.solve() == pytest.approx(qss_result, abs=1e-2)
 
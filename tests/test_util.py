@@ -0,0 +1,27 @@
+import numpy as np
+from qss import util
+
+
+class TestStopCrit:
+    def test_stop_crit_nan(self):
+        dim = 3
+        zk1 = np.array([0.0, np.nan, 0.0])
+        zeros = np.zeros(dim)
+        A = np.eye(dim)
+        for crit in ["orig", "admm"]:
+            assert not util.evaluate_stop_crit(
+                zeros,
+                zeros,
+                zk1,
+                zeros,
+                zeros,
+                dim,
+                np.ones(dim),
+                1e-5,
+                1e-5,
+                np.eye(dim),
+                zeros,
+                A,
+                zeros,
+                crit=crit,
+            )